@@ -0,0 +1,47 @@
+"""Compressed on-disk archive of ended meeting sessions.
+
+Each archived session is one gzip-compressed NDJSON file: a header line with
+the session's metadata followed by one line per conversation turn, so exports
+can stream turns back without decompressing the whole file into memory.
+"""
+import gzip
+import json
+import os
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator
+
+
+class ArchiveStore:
+    def __init__(self, root: Path):
+        self.root = Path(root)
+
+    def new_path(self, session_id: str) -> Path:
+        # A fresh name per write, so an attempt that loses a race can delete
+        # its own file without touching the one the session points to
+        return self.root / f"{session_id}-{uuid.uuid4().hex[:12]}.ndjson.gz"
+
+    def write(self, session: Dict[str, Any], turns: Iterable[Dict[str, Any]]) -> str:
+        """Write a session archive atomically and return its file name"""
+        self.root.mkdir(parents=True, exist_ok=True)
+        path = self.new_path(session["id"])
+        tmp_path = path.with_suffix(".tmp")
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            f.write(json.dumps({"session": session}, default=str) + "\n")
+            for turn in turns:
+                f.write(json.dumps(turn, default=str) + "\n")
+        os.replace(tmp_path, path)
+        return path.name
+
+    def iter_turns(self, file_name: str) -> Iterator[Dict[str, Any]]:
+        """Yield archived turns one at a time"""
+        with gzip.open(self.root / file_name, "rt", encoding="utf-8") as f:
+            f.readline()  # header
+            for line in f:
+                yield json.loads(line)
+
+    def delete(self, file_name: str) -> None:
+        try:
+            os.remove(self.root / file_name)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Offline batch replay of recorded meeting transcripts.
+
+Replays JSONL transcripts through the same get_ai_chat path the live meeting
+uses and writes one JSONL result per turn (response, latency, token counts).
+Each input line is ``{"speaker": ..., "message": ...}`` with an optional
+``transcript_id``; lines without one belong to a transcript named after the
+file.
+
+    python replay.py meetings.jsonl --profile profile.json --stub --concurrency 32
+    python replay.py a.jsonl b.jsonl --profile-id <id> --processes 4 --output results.jsonl
+
+``--profile`` takes a JSON file with MeetingProfile fields; ``--profile-id``
+loads a stored profile from Mongo. Without ``--stub`` turns go to Gemini.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List
+
+from server import MeetingProfile, StubLlmChat, db, gemini_chat, parse_transcripts, run_replay
+
+
+def positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
+def load_transcripts(paths: List[str]) -> Dict[str, List[Dict[str, str]]]:
+    transcripts: Dict[str, List[Dict[str, str]]] = {}
+    for path in paths:
+        with open(path) as f:
+            for transcript_id, turns in parse_transcripts(f, default_id=Path(path).stem).items():
+                transcripts.setdefault(transcript_id, []).extend(turns)
+    return transcripts
+
+
+def shard(transcripts: Dict[str, List[Dict[str, str]]], count: int) -> List[Dict[str, List[Dict[str, str]]]]:
+    """Split transcripts into ``count`` shards of roughly equal turn counts"""
+    shards: List[Dict[str, List[Dict[str, str]]]] = [{} for _ in range(count)]
+    sizes = [0] * count
+    for transcript_id, turns in sorted(transcripts.items(), key=lambda item: -len(item[1])):
+        smallest = sizes.index(min(sizes))
+        shards[smallest][transcript_id] = turns
+        sizes[smallest] += len(turns)
+    return [s for s in shards if s]
+
+
+def make_llm_factory(stub: bool, stub_latency_ms: float):
+    if not stub:
+        return gemini_chat
+    return lambda session_id, system_message: StubLlmChat(session_id, system_message, stub_latency_ms / 1000)
+
+
+def run_shard(transcripts: Dict[str, List[Dict[str, str]]], profile: Dict[str, Any], output: str, concurrency: int, stub: bool, stub_latency_ms: float) -> Dict[str, Any]:
+    with open(output, "w") as results_file:
+        return asyncio.run(run_replay(
+            transcripts,
+            MeetingProfile(**profile),
+            results_file,
+            concurrency,
+            make_llm_factory(stub, stub_latency_ms)
+        ))
+
+
+async def fetch_profile(profile_id: str) -> Dict[str, Any]:
+    profile = await db.meeting_profiles.find_one({"id": profile_id}, {"_id": 0})
+    if not profile:
+        raise SystemExit(f"Profile not found: {profile_id}")
+    return profile
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("transcripts", nargs="+", help="JSONL transcript files")
+    profile_group = parser.add_mutually_exclusive_group(required=True)
+    profile_group.add_argument("--profile", help="JSON file with MeetingProfile fields")
+    profile_group.add_argument("--profile-id", help="id of a stored meeting profile")
+    parser.add_argument("--output", default="replay_results.jsonl")
+    parser.add_argument("--concurrency", type=positive_int, default=8, help="transcripts replayed at once per process")
+    parser.add_argument("--processes", type=positive_int, default=1, help="shard transcripts across this many processes")
+    parser.add_argument("--stub", action="store_true", help="use the offline stub LLM instead of Gemini")
+    parser.add_argument("--stub-latency-ms", type=float, default=0.0, help="simulated stub response latency")
+    args = parser.parse_args()
+
+    if args.profile:
+        with open(args.profile) as f:
+            profile = MeetingProfile(**json.load(f)).dict()
+    else:
+        profile = asyncio.run(fetch_profile(args.profile_id))
+
+    transcripts = load_transcripts(args.transcripts)
+    if not transcripts:
+        raise SystemExit("No transcript turns found")
+    shards = shard(transcripts, args.processes)
+    started = time.perf_counter()
+
+    if len(shards) == 1:
+        summaries = [run_shard(shards[0], profile, args.output, args.concurrency, args.stub, args.stub_latency_ms)]
+    else:
+        part_paths = [f"{args.output}.part{i}" for i in range(len(shards))]
+        with ProcessPoolExecutor(max_workers=len(shards)) as pool:
+            futures = [
+                pool.submit(run_shard, transcript_shard, profile, part_path, args.concurrency, args.stub, args.stub_latency_ms)
+                for transcript_shard, part_path in zip(shards, part_paths)
+            ]
+            summaries = [future.result() for future in futures]
+        with open(args.output, "w") as out:
+            for part_path in part_paths:
+                with open(part_path) as part:
+                    for line in part:
+                        out.write(line)
+                os.remove(part_path)
+
+    elapsed = time.perf_counter() - started
+    turns = sum(summary["turns"] for summary in summaries)
+    latency_total = sum(summary["mean_latency_ms"] * summary["turns"] for summary in summaries if summary["turns"])
+    summary = {
+        "transcripts": sum(summary["transcripts"] for summary in summaries),
+        "turns": turns,
+        "errors": sum(summary["errors"] for summary in summaries),
+        "processes": len(shards),
+        "elapsed_seconds": round(elapsed, 3),
+        "turns_per_second": round(turns / elapsed, 2) if elapsed else None,
+        "mean_latency_ms": round(latency_total / turns, 3) if turns else None,
+        "prompt_tokens": sum(summary["prompt_tokens"] for summary in summaries),
+        "completion_tokens": sum(summary["completion_tokens"] for summary in summaries),
+    }
+    print(json.dumps(summary, indent=2))
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Transcript search benchmark.
+
+Generates a synthetic dataset of meeting sessions shaped like
+``meeting_sessions`` documents, builds a TurnSearchIndex over it and reports
+query latency percentiles.
+
+    python search_benchmark.py --sessions 5000 --turns 60
+    python search_benchmark.py --sessions 5000 --turns 60 --output sessions.jsonl
+
+The JSONL output can be loaded into Mongo with
+``mongoimport --db test_database --collection meeting_sessions sessions.jsonl``.
+"""
+
+import argparse
+import json
+import random
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List
+
+from search_index import TurnSearchIndex
+
+TOPICS = [
+    "roadmap", "budget", "hiring", "launch", "pricing", "onboarding", "migration",
+    "security", "compliance", "latency", "dashboard", "retention", "churn",
+    "forecast", "vendor", "contract", "sprint", "backlog", "incident", "postmortem",
+    "analytics", "marketing", "campaign", "partnership", "integration", "mobile",
+    "checkout", "billing", "invoice", "support", "escalation", "training",
+]
+
+FILLER = [
+    "think", "should", "next", "quarter", "team", "plan", "update", "status",
+    "review", "timeline", "risk", "owner", "decision", "follow", "question",
+    "agree", "concern", "priority", "estimate", "deadline", "scope", "feedback",
+    "customer", "metric", "goal", "week", "progress", "blocker", "proposal",
+]
+
+
+def _sentence(rng: random.Random, length: int) -> str:
+    words = [rng.choice(TOPICS) if rng.random() < 0.2 else rng.choice(FILLER) for _ in range(length)]
+    # Long-tail vocabulary so rare-term queries have something to find
+    words.append(f"ticket{rng.randint(0, 50000)}")
+    return " ".join(words)
+
+
+def generate_sessions(sessions: int, turns: int, seed: int = 0) -> Iterator[Dict[str, Any]]:
+    """Yield synthetic session documents with ``turns`` history entries each"""
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1)
+    for i in range(sessions):
+        created_at = start + timedelta(minutes=30 * i)
+        history = []
+        for t in range(turns):
+            history.append({
+                "user_message": _sentence(rng, rng.randint(8, 24)),
+                "ai_response": _sentence(rng, rng.randint(15, 40)),
+                "timestamp": (created_at + timedelta(seconds=20 * t)).isoformat(),
+            })
+        yield {
+            "id": str(uuid.UUID(int=rng.getrandbits(128))),
+            "title": f"{rng.choice(TOPICS).title()} sync #{i}",
+            "profile_id": "benchmark",
+            "participants": [],
+            "status": "ended",
+            "conversation_history": history,
+            "created_at": created_at.isoformat(),
+            "ended_at": (created_at + timedelta(seconds=20 * turns)).isoformat(),
+            "archived": False,
+            "turn_count": None,
+            "user_id": "default",
+        }
+
+
+def _percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=5000)
+    parser.add_argument("--turns", type=int, default=60, help="turns per session")
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="also write the generated sessions as JSONL")
+    args = parser.parse_args()
+
+    index = TurnSearchIndex()
+    out = open(args.output, "w") if args.output else None
+    started = time.perf_counter()
+    try:
+        for session in generate_sessions(args.sessions, args.turns, args.seed):
+            index.add_session(session["id"], session["conversation_history"])
+            if out:
+                out.write(json.dumps(session) + "\n")
+    finally:
+        if out:
+            out.close()
+    build_s = time.perf_counter() - started
+    print(f"Indexed {len(index)} turns from {args.sessions} sessions in {build_s:.1f}s")
+
+    # Query mix by kind; the 29-term queries approach the API's term cap
+    vocabulary = TOPICS + FILLER
+    kinds = {
+        "1 topic": lambda rng: rng.choice(TOPICS),
+        "2 topics": lambda rng: f"{rng.choice(TOPICS)} {rng.choice(TOPICS)}",
+        "ticket": lambda rng: f"ticket{rng.randint(0, 50000)}",
+        "5 terms": lambda rng: " ".join(rng.sample(vocabulary, 5)),
+        "29 terms": lambda rng: " ".join(rng.sample(vocabulary, 29)),
+    }
+    rng = random.Random(args.seed + 1)
+    latencies: Dict[str, List[float]] = {kind: [] for kind in kinds}
+    for _ in range(args.queries):
+        for kind, make_query in kinds.items():
+            query = make_query(rng)
+            started = time.perf_counter()
+            index.search(query, limit=args.limit)
+            latencies[kind].append((time.perf_counter() - started) * 1000)
+
+    print(f"Queries: {args.queries} per kind")
+    for kind, samples in latencies.items():
+        summary = "  ".join(f"p{pct}: {_percentile(samples, pct):7.2f} ms" for pct in (50, 95, 99))
+        print(f"  {kind:<9} {summary}")
+
+
+if __name__ == "__main__":
+    main()
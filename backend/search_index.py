@@ -0,0 +1,188 @@
+"""In-process inverted index over meeting conversation turns.
+
+The index is built from ``meeting_sessions`` in the background on startup and
+updated as turns are written, so ``GET /api/search`` never has to scan
+conversation histories. It is deliberately free of FastAPI/Mongo imports so
+benchmarks can use it directly.
+"""
+import math
+import re
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+TOKEN_RE = re.compile(r"\w+")
+
+STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have i if in is it its of on or "
+    "so that the their there this to was we were will with you your".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """Casefold ``text`` and split it into indexable (Unicode word) terms"""
+    return [t for t in TOKEN_RE.findall(text.casefold()) if t not in STOPWORDS]
+
+
+def turn_text(entry: Dict[str, Any]) -> str:
+    """Searchable text of a ``conversation_history`` entry"""
+    return f"{entry.get('user_message', '')} {entry.get('ai_response', '')}"
+
+
+class _Postings:
+    """Turn ids and term frequencies for one term, with an append buffer"""
+
+    __slots__ = ("ids", "tfs", "pending_ids", "pending_tfs")
+
+    def __init__(self):
+        self.ids = np.empty(0, dtype=np.int64)
+        self.tfs = np.empty(0, dtype=np.float32)
+        self.pending_ids: List[int] = []
+        self.pending_tfs: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self.ids) + len(self.pending_ids)
+
+    def append(self, turn_id: int, tf: int) -> None:
+        self.pending_ids.append(turn_id)
+        self.pending_tfs.append(tf)
+
+    def arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        if self.pending_ids:
+            self.ids = np.concatenate((self.ids, np.array(self.pending_ids, dtype=np.int64)))
+            self.tfs = np.concatenate((self.tfs, np.array(self.pending_tfs, dtype=np.float32)))
+            self.pending_ids = []
+            self.pending_tfs = []
+        return self.ids, self.tfs
+
+    def discard(self, removed: np.ndarray) -> None:
+        """Drop postings whose turn id is flagged in the boolean ``removed`` mask"""
+        ids, tfs = self.arrays()
+        keep = ~removed[ids]
+        self.ids = ids[keep]
+        self.tfs = tfs[keep]
+
+
+class TurnSearchIndex:
+    """BM25-ranked inverted index keyed by (session id, turn offset)
+
+    Postings are numpy arrays so a query scores every matching turn in a few
+    vectorised passes instead of a Python loop per posting. The index is
+    per-process: with several workers each keeps its own copy. Public methods
+    take a lock, so callers may run them in worker threads.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, _Postings] = {}
+        # turn id -> (session id, turn offset); None once removed
+        self._turns: List[Optional[Tuple[str, int]]] = []
+        self._lengths = np.zeros(1024, dtype=np.float32)
+        self._terms: List[Tuple[str, ...]] = []
+        self._session_turns: Dict[str, List[int]] = {}
+        self._total_length = 0
+        self._live_turns = 0
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return self._live_turns
+
+    def turn_count(self, session_id: str) -> int:
+        return len(self._session_turns.get(session_id, ()))
+
+    def add_turn(self, session_id: str, offset: int, text: str) -> None:
+        tokens = tokenize(text)
+        with self._lock:
+            self._add_tokens(session_id, offset, tokens)
+
+    def _add_tokens(self, session_id: str, offset: int, tokens: List[str]) -> None:
+        turn_id = len(self._turns)
+        counts: Dict[str, int] = {}
+        for token in tokens:
+            counts[token] = counts.get(token, 0) + 1
+        for term, tf in counts.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = _Postings()
+            postings.append(turn_id, tf)
+
+        if turn_id == len(self._lengths):
+            self._lengths = np.concatenate((self._lengths, np.zeros_like(self._lengths)))
+        self._lengths[turn_id] = len(tokens)
+        self._turns.append((session_id, offset))
+        self._terms.append(tuple(counts))
+        self._session_turns.setdefault(session_id, []).append(turn_id)
+        self._total_length += len(tokens)
+        self._live_turns += 1
+
+    def add_session(self, session_id: str, history: Iterable[Dict[str, Any]]) -> None:
+        """Index every turn of a session's ``conversation_history``"""
+        tokenized = [tokenize(turn_text(entry)) for entry in history]
+        with self._lock:
+            start = self.turn_count(session_id)
+            for offset, tokens in enumerate(tokenized, start):
+                self._add_tokens(session_id, offset, tokens)
+
+    def remove_session(self, session_id: str) -> None:
+        self.remove_sessions([session_id])
+
+    def remove_sessions(self, session_ids: Iterable[str]) -> None:
+        """Remove sessions, rewriting each affected term's postings only once"""
+        with self._lock:
+            removed = np.zeros(len(self._turns), dtype=bool)
+            affected = set()
+            for session_id in session_ids:
+                for turn_id in self._session_turns.pop(session_id, ()):
+                    affected.update(self._terms[turn_id])
+                    self._total_length -= int(self._lengths[turn_id])
+                    self._live_turns -= 1
+                    self._turns[turn_id] = None
+                    self._terms[turn_id] = ()
+                    removed[turn_id] = True
+            for term in affected:
+                postings = self._postings[term]
+                postings.discard(removed)
+                if not len(postings):
+                    del self._postings[term]
+
+    def search(self, query: str, limit: int = 20, offset: int = 0) -> Tuple[int, List[Dict[str, Any]]]:
+        """Return ``(total matches, hits)`` for one page of ranked results"""
+        terms = set(tokenize(query))
+        with self._lock:
+            return self._search(terms, limit, offset)
+
+    def _search(self, terms, limit: int, offset: int) -> Tuple[int, List[Dict[str, Any]]]:
+        if not terms or not self._live_turns:
+            return 0, []
+
+        n = self._live_turns
+        k1 = self.k1
+        length_base = k1 * (1 - self.b)
+        length_scale = k1 * self.b / (self._total_length / n or 1)
+
+        scores = np.zeros(len(self._turns), dtype=np.float32)
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            ids, tfs = postings.arrays()
+            df = len(ids)
+            idf = math.log(1 + (n - df + 0.5) / (df + 0.5))
+            norm = length_base + length_scale * self._lengths[ids]
+            # ids are unique within one term, so fancy-index += is safe
+            scores[ids] += idf * (k1 + 1) * tfs / (tfs + norm)
+
+        matched = np.flatnonzero(scores)
+        total = len(matched)
+        wanted = offset + limit
+        if wanted < total:
+            matched = matched[np.argpartition(-scores[matched], wanted - 1)[:wanted]]
+        ranked = matched[np.argsort(-scores[matched], kind="stable")][offset:]
+
+        hits = []
+        for turn_id in ranked.tolist():
+            session_id, turn_offset = self._turns[turn_id]
+            hits.append({"session_id": session_id, "turn_offset": turn_offset, "score": round(float(scores[turn_id]), 4)})
+        return total, hits
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Read-path serialization microbenchmark.
+
+Compares, through a real FastAPI request cycle, the model path (build a
+Pydantic model per document, then validate and serialize again via
+``response_model``) with the fast path used by the read endpoints (serialize
+projected documents directly with orjson).
+
+    python serialization_benchmark.py --sessions 100 --turns 200
+"""
+
+import argparse
+import base64
+import logging
+import os
+import statistics
+import time
+import uuid
+from datetime import datetime
+from typing import List
+
+from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
+from fastapi.testclient import TestClient
+
+from search_benchmark import generate_sessions
+from server import MeetingSession, VoiceProfile, SESSION_PROJECTION
+
+
+def _as_stored(doc: dict) -> dict:
+    """Shape a generated session like a projected Mongo read"""
+    doc = {key: value for key, value in doc.items() if key in SESSION_PROJECTION}
+    doc["created_at"] = datetime.fromisoformat(doc["created_at"])
+    doc["ended_at"] = datetime.fromisoformat(doc["ended_at"])
+    return doc
+
+
+def build_app(sessions: List[dict], voices: List[dict]) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/model/sessions", response_model=List[MeetingSession])
+    async def model_sessions():
+        return [MeetingSession(**session) for session in sessions]
+
+    @app.get("/fast/sessions", response_model=List[MeetingSession])
+    async def fast_sessions():
+        return ORJSONResponse(sessions)
+
+    @app.get("/model/voice", response_model=List[VoiceProfile])
+    async def model_voice():
+        return [VoiceProfile(**voice) for voice in voices]
+
+    @app.get("/fast/voice", response_model=List[VoiceProfile])
+    async def fast_voice():
+        return ORJSONResponse(voices)
+
+    return app
+
+
+def bench(client: TestClient, path: str, repeat: int) -> List[float]:
+    client.get(path)  # warm up
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        response = client.get(path)
+        samples.append((time.perf_counter() - started) * 1000)
+        response.raise_for_status()
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=100)
+    parser.add_argument("--turns", type=int, default=200, help="conversation turns per session")
+    parser.add_argument("--voices", type=int, default=10)
+    parser.add_argument("--audio-kb", type=int, default=512, help="raw audio size per voice profile")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    sessions = [_as_stored(s) for s in generate_sessions(args.sessions, args.turns)]
+    voices = [
+        {
+            "id": str(uuid.uuid4()),
+            "name": f"Voice {i}",
+            "audio_data": base64.b64encode(os.urandom(args.audio_kb * 1024)).decode("utf-8"),
+            "duration": 10.0,
+            "created_at": datetime.utcnow(),
+            "user_id": "default",
+        }
+        for i in range(args.voices)
+    ]
+
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    client = TestClient(build_app(sessions, voices))
+    assert client.get("/model/sessions").json() == client.get("/fast/sessions").json()
+    assert client.get("/model/voice").json() == client.get("/fast/voice").json()
+
+    print(f"{args.sessions} sessions x {args.turns} turns, {args.voices} voices x {args.audio_kb} KB audio")
+    for name in ("sessions", "voice"):
+        model = bench(client, f"/model/{name}", args.repeat)
+        fast = bench(client, f"/fast/{name}", args.repeat)
+        model_ms, fast_ms = statistics.median(model), statistics.median(fast)
+        print(f"  {name:<8} model: {model_ms:8.2f} ms   fast: {fast_ms:8.2f} ms   speedup: {model_ms / fast_ms:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,30 @@
-from fastapi import FastAPI, APIRouter, WebSocket, WebSocketDisconnect, HTTPException, UploadFile, File, Form
-from fastapi.responses import StreamingResponse
+from fastapi import FastAPI, APIRouter, WebSocket, WebSocketDisconnect, HTTPException, UploadFile, File, Form, Query, Request, Response
+from fastapi.responses import StreamingResponse, ORJSONResponse, FileResponse
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
+from starlette.concurrency import iterate_in_threadpool
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError
 import os
 import logging
 from pathlib import Path
 from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Callable, Iterable, TextIO, Tuple
 import uuid
 import json
 import asyncio
-from datetime import datetime
+import csv
+import time
+from datetime import datetime, timedelta
 from emergentintegrations.llm.chat import LlmChat, UserMessage
 import websockets
 import base64
 import io
 
+from search_index import TurnSearchIndex, tokenize, turn_text
+from archive_store import ArchiveStore
+
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
@@ -58,6 +66,9 @@ class MeetingSession(BaseModel):
     status: str = "active"  # active, paused, ended
     conversation_history: List[Dict[str, Any]] = []
     created_at: datetime = Field(default_factory=datetime.utcnow)
+    ended_at: Optional[datetime] = None
+    archived: bool = False  # history moved to the archive store
+    turn_count: Optional[int] = None  # set when archived
     user_id: str = "default"
 
 class MeetingSessionCreate(BaseModel):
@@ -85,14 +96,150 @@ class AIResponse(BaseModel):
     response_type: str  # answer, question, acknowledgment
     audio_url: Optional[str] = None
 
+class MeetingProfileUpdate(BaseModel):
+    id: str
+    name: Optional[str] = None
+    role: Optional[str] = None
+    personality: Optional[str] = None
+    response_style: Optional[str] = None
+    meeting_topics: Optional[List[str]] = None
+
+class ProfileIds(BaseModel):
+    ids: List[str]
+
+class SessionFilter(BaseModel):
+    ids: Optional[List[str]] = None
+    profile_id: Optional[str] = None
+    status: Optional[str] = None
+    created_before: Optional[datetime] = None
+
+class SessionBulkStatusUpdate(BaseModel):
+    filter: SessionFilter
+    status: str
+
+class BulkItemResult(BaseModel):
+    index: int
+    id: Optional[str] = None
+    ok: bool
+    error: Optional[str] = None
+
+class BulkResult(BaseModel):
+    succeeded: int
+    failed: int
+    results: List[BulkItemResult]
+
+class ReplayJob(BaseModel):
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    profile_id: str
+    status: str = "queued"  # queued, running, completed, failed
+    stub: bool = False
+    concurrency: int = 8
+    transcripts: int = 0
+    turns: int = 0
+    summary: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    user_id: str = "default"
+
+class SearchHit(BaseModel):
+    session_id: str
+    turn_offset: int
+    score: float
+    session_title: Optional[str] = None
+
+class SearchResults(BaseModel):
+    query: str
+    total: int
+    limit: int
+    offset: int
+    hits: List[SearchHit]
+
+# Read projections. Stored documents are always written from these models, so
+# read endpoints serialize the projected documents directly with orjson instead
+# of rebuilding a model per document and letting response_model validate again.
+def model_projection(model) -> Dict[str, int]:
+    return {"_id": 0, **{name: 1 for name in model.model_fields}}
+
+PROFILE_PROJECTION = model_projection(MeetingProfile)
+SESSION_PROJECTION = model_projection(MeetingSession)
+VOICE_PROFILE_PROJECTION = model_projection(VoiceProfile)
+
+# Change versions. Every write to a collection bumps a per-user counter in
+# change_versions; read endpoints use it as their ETag so an unchanged dashboard
+# refresh is answered with 304 before the collection is queried at all.
+async def get_change_version(collection: str, user_id: str = "default") -> int:
+    doc = await db.change_versions.find_one({"user_id": user_id, "collection": collection}, {"_id": 0, "version": 1})
+    return doc["version"] if doc else 0
+
+async def bump_change_version(collection: str, user_id: str = "default"):
+    await db.change_versions.update_one(
+        {"user_id": user_id, "collection": collection},
+        {"$inc": {"version": 1}},
+        upsert=True
+    )
+
+def etag_headers(etag: str) -> Dict[str, str]:
+    # no-cache makes browsers revalidate with If-None-Match on every refresh
+    return {"ETag": etag, "Cache-Control": "no-cache"}
+
+async def check_etag(request: Request, collection: str, item_id: Optional[str] = None, user_id: str = "default"):
+    """Return (etag, 304 response or None) for a read of ``collection``
+
+    Single-item reads pass ``item_id``. Their ETag names the item, so it can only
+    match a tag issued while the item existed (deleting it bumps the version),
+    and ``If-None-Match: *`` is ignored so a missing item still gets its 404.
+    """
+    # The version is read before the data, so a concurrent write can only make
+    # the ETag older than the body, which costs one extra full response later.
+    version = await get_change_version(collection, user_id)
+    etag = f'"{collection}-{version}-{item_id}"' if item_id else f'"{collection}-{version}"'
+    if_none_match = request.headers.get("if-none-match", "")
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    if etag in candidates or (item_id is None and "*" in candidates):
+        return etag, Response(status_code=304, headers=etag_headers(etag))
+    return etag, None
+
 # Global chat instances store
 chat_instances: Dict[str, LlmChat] = {}
 
+# Transcript search index, built in the background on startup and updated as
+# turns are written. Changes made while it is still warming are queued and
+# applied once the build finishes; a failed build is retried with backoff and
+# nothing is queued in between, since the retry reads everything from Mongo.
+SEARCH_INDEX_RETRY_SECONDS = 5
+SEARCH_INDEX_MAX_RETRY_SECONDS = 300
+# Each distinct term costs one pass over its postings, so queries are bounded
+SEARCH_MAX_QUERY_LENGTH = 512
+SEARCH_MAX_TERMS = 32
+search_index = TurnSearchIndex()
+search_index_state = "warming"  # warming | ready | failed
+search_index_task: Optional[asyncio.Task] = None
+pending_index_turns: List[Tuple[str, int, Dict[str, Any]]] = []
+pending_index_removals: List[str] = []
+
+# Index work runs in worker threads (the index is locked internally) so large
+# updates never stall the event loop.
+async def index_turn(session_id: str, offset: int, entry: Dict[str, Any]):
+    if search_index_state == "ready":
+        await asyncio.to_thread(search_index.add_turn, session_id, offset, turn_text(entry))
+    elif search_index_state == "warming":
+        pending_index_turns.append((session_id, offset, entry))
+
+async def unindex_sessions(session_ids: List[str]):
+    if search_index_state == "ready":
+        await asyncio.to_thread(search_index.remove_sessions, session_ids)
+    elif search_index_state == "warming":
+        pending_index_removals.extend(session_ids)
+
+# Archive of ended sessions
+archive_store = ArchiveStore(Path(os.environ.get('ARCHIVE_DIR', ROOT_DIR / 'archive')))
+ARCHIVE_AFTER_DAYS = float(os.environ.get('ARCHIVE_AFTER_DAYS', 30))
+ARCHIVE_INTERVAL_SECONDS = float(os.environ.get('ARCHIVE_INTERVAL_SECONDS', 3600))
+archiver_task: Optional[asyncio.Task] = None
+
 # Utility functions
-async def get_ai_chat(session_id: str, profile: MeetingProfile) -> LlmChat:
-    """Get or create AI chat instance for session"""
-    if session_id not in chat_instances:
-        system_message = f"""You are {profile.name}, a {profile.role}. 
+def build_system_message(profile: MeetingProfile) -> str:
+    return f"""You are {profile.name}, a {profile.role}. 
         Personality: {profile.personality}
         Response style: {profile.response_style}
         
@@ -105,12 +252,18 @@ async def get_ai_chat(session_id: str, profile: MeetingProfile) -> LlmChat:
         Meeting topics you're familiar with: {', '.join(profile.meeting_topics)}
         
         Important: Always respond as if you're the person attending the meeting, not an AI assistant."""
-        
-        chat_instances[session_id] = LlmChat(
-            api_key=os.environ.get('GEMINI_API_KEY'),
-            session_id=session_id,
-            system_message=system_message
-        ).with_model("gemini", "gemini-2.0-flash").with_max_tokens(2048)
+
+def gemini_chat(session_id: str, system_message: str) -> LlmChat:
+    return LlmChat(
+        api_key=os.environ.get('GEMINI_API_KEY'),
+        session_id=session_id,
+        system_message=system_message
+    ).with_model("gemini", "gemini-2.0-flash").with_max_tokens(2048)
+
+async def get_ai_chat(session_id: str, profile: MeetingProfile, llm_factory: Callable[[str, str], Any] = gemini_chat) -> LlmChat:
+    """Get or create AI chat instance for session"""
+    if session_id not in chat_instances:
+        chat_instances[session_id] = llm_factory(session_id, build_system_message(profile))
     
     return chat_instances[session_id]
 
@@ -125,28 +278,49 @@ async def create_profile(profile: MeetingProfileCreate):
     profile_dict = profile.dict()
     profile_obj = MeetingProfile(**profile_dict)
     await db.meeting_profiles.insert_one(profile_obj.dict())
+    await bump_change_version("meeting_profiles")
     return profile_obj
 
 @api_router.get("/profiles", response_model=List[MeetingProfile])
-async def get_profiles():
-    profiles = await db.meeting_profiles.find({"user_id": "default"}).to_list(100)
-    return [MeetingProfile(**profile) for profile in profiles]
+async def get_profiles(request: Request):
+    etag, not_modified = await check_etag(request, "meeting_profiles")
+    if not_modified:
+        return not_modified
+    profiles = await db.meeting_profiles.find({"user_id": "default"}, PROFILE_PROJECTION).to_list(100)
+    return ORJSONResponse(profiles, headers=etag_headers(etag))
 
 @api_router.get("/profiles/{profile_id}", response_model=MeetingProfile)
-async def get_profile(profile_id: str):
-    profile = await db.meeting_profiles.find_one({"id": profile_id})
+async def get_profile(profile_id: str, request: Request):
+    etag, not_modified = await check_etag(request, "meeting_profiles", profile_id)
+    if not_modified:
+        return not_modified
+    profile = await db.meeting_profiles.find_one({"id": profile_id}, PROFILE_PROJECTION)
     if not profile:
         raise HTTPException(status_code=404, detail="Profile not found")
-    return MeetingProfile(**profile)
+    return ORJSONResponse(profile, headers=etag_headers(etag))
 
 @api_router.delete("/profiles/{profile_id}")
 async def delete_profile(profile_id: str):
     result = await db.meeting_profiles.delete_one({"id": profile_id})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Profile not found")
+    await bump_change_version("meeting_profiles")
     return {"message": "Profile deleted"}
 
 # Meeting Sessions
+async def set_session_status(query: Dict[str, Any], status: str) -> Tuple[int, int]:
+    """Set the status of matching sessions and return (matched, modified)"""
+    result = await db.meeting_sessions.update_many(query, {"$set": {"status": status}})
+    changed = result.modified_count
+    if status == "ended":
+        # ended_at is what the archiver ages sessions by, so ending a session
+        # again must not move it
+        ended = await db.meeting_sessions.update_many({**query, "ended_at": None}, {"$set": {"ended_at": datetime.utcnow()}})
+        changed += ended.modified_count
+    if changed:
+        await bump_change_version("meeting_sessions")
+    return result.matched_count, result.modified_count
+
 @api_router.post("/sessions", response_model=MeetingSession)
 async def create_session(session: MeetingSessionCreate):
     # Verify profile exists
@@ -157,30 +331,197 @@ async def create_session(session: MeetingSessionCreate):
     session_dict = session.dict()
     session_obj = MeetingSession(**session_dict)
     await db.meeting_sessions.insert_one(session_obj.dict())
+    await bump_change_version("meeting_sessions")
     return session_obj
 
 @api_router.get("/sessions", response_model=List[MeetingSession])
-async def get_sessions():
-    sessions = await db.meeting_sessions.find({"user_id": "default"}).sort("created_at", -1).to_list(100)
-    return [MeetingSession(**session) for session in sessions]
+async def get_sessions(request: Request):
+    etag, not_modified = await check_etag(request, "meeting_sessions")
+    if not_modified:
+        return not_modified
+    sessions = await db.meeting_sessions.find({"user_id": "default"}, SESSION_PROJECTION).sort("created_at", -1).to_list(100)
+    return ORJSONResponse(sessions, headers=etag_headers(etag))
 
 @api_router.get("/sessions/{session_id}", response_model=MeetingSession)
-async def get_session(session_id: str):
-    session = await db.meeting_sessions.find_one({"id": session_id})
+async def get_session(session_id: str, request: Request):
+    etag, not_modified = await check_etag(request, "meeting_sessions", session_id)
+    if not_modified:
+        return not_modified
+    session = await db.meeting_sessions.find_one({"id": session_id}, SESSION_PROJECTION)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
-    return MeetingSession(**session)
+    return ORJSONResponse(session, headers=etag_headers(etag))
 
 @api_router.put("/sessions/{session_id}/status")
 async def update_session_status(session_id: str, status: str):
-    result = await db.meeting_sessions.update_one(
-        {"id": session_id},
-        {"$set": {"status": status}}
-    )
-    if result.matched_count == 0:
+    matched, _ = await set_session_status({"id": session_id}, status)
+    if matched == 0:
         raise HTTPException(status_code=404, detail="Session not found")
     return {"message": "Status updated"}
 
+# Bulk operations
+BULK_LIMIT = 1000
+
+def check_bulk_size(items: List[Any]):
+    if not items:
+        raise HTTPException(status_code=400, detail="No items given")
+    if len(items) > BULK_LIMIT:
+        raise HTTPException(status_code=400, detail=f"At most {BULK_LIMIT} items per request")
+
+def bulk_result(results: List[BulkItemResult]) -> BulkResult:
+    succeeded = sum(1 for result in results if result.ok)
+    return BulkResult(succeeded=succeeded, failed=len(results) - succeeded, results=results)
+
+def write_errors(error: BulkWriteError) -> Dict[int, str]:
+    """Map each failed operation's position in the batch to its error message"""
+    return {e["index"]: e.get("errmsg", "Write failed") for e in error.details.get("writeErrors", [])}
+
+async def insert_bulk(collection, docs: List[Dict[str, Any]], indexes: List[int], results: Dict[int, BulkItemResult]) -> int:
+    """insert_many without stopping at the first failure, recording a result per item"""
+    failed = {}
+    try:
+        await collection.insert_many([dict(doc) for doc in docs], ordered=False)
+    except BulkWriteError as e:
+        failed = write_errors(e)
+    for position, (index, doc) in enumerate(zip(indexes, docs)):
+        if position in failed:
+            results[index] = BulkItemResult(index=index, id=doc["id"], ok=False, error=failed[position])
+        else:
+            results[index] = BulkItemResult(index=index, id=doc["id"], ok=True)
+    return len(docs) - len(failed)
+
+def session_filter_query(session_filter: SessionFilter) -> Dict[str, Any]:
+    query: Dict[str, Any] = {"user_id": "default"}
+    if session_filter.ids is not None:
+        query["id"] = {"$in": session_filter.ids}
+    if session_filter.profile_id is not None:
+        query["profile_id"] = session_filter.profile_id
+    if session_filter.status is not None:
+        query["status"] = session_filter.status
+    if session_filter.created_before is not None:
+        query["created_at"] = {"$lt": session_filter.created_before}
+    if len(query) == 1:
+        # Never let an empty filter touch every session
+        raise HTTPException(status_code=400, detail="Filter must have at least one criterion")
+    return query
+
+@api_router.post("/profiles/bulk", response_model=BulkResult)
+async def create_profiles_bulk(profiles: List[MeetingProfileCreate]):
+    check_bulk_size(profiles)
+    docs = [MeetingProfile(**profile.dict()).dict() for profile in profiles]
+    results: Dict[int, BulkItemResult] = {}
+    if await insert_bulk(db.meeting_profiles, docs, list(range(len(docs))), results):
+        await bump_change_version("meeting_profiles")
+    return bulk_result([results[i] for i in range(len(docs))])
+
+@api_router.patch("/profiles/bulk", response_model=BulkResult)
+async def update_profiles_bulk(updates: List[MeetingProfileUpdate]):
+    check_bulk_size(updates)
+    ids = [update.id for update in updates]
+    existing = {
+        profile["id"]
+        async for profile in db.meeting_profiles.find({"id": {"$in": ids}, "user_id": "default"}, {"_id": 0, "id": 1})
+    }
+    
+    results: Dict[int, BulkItemResult] = {}
+    operations = []
+    operation_indexes = []
+    for index, update in enumerate(updates):
+        fields = update.dict(exclude_unset=True, exclude={"id"})
+        # Every profile field is required, so an explicit null would store an invalid profile
+        null_fields = sorted(field for field, value in fields.items() if value is None)
+        if update.id not in existing:
+            results[index] = BulkItemResult(index=index, id=update.id, ok=False, error="Profile not found")
+        elif null_fields:
+            results[index] = BulkItemResult(index=index, id=update.id, ok=False, error=f"Fields cannot be null: {', '.join(null_fields)}")
+        elif not fields:
+            results[index] = BulkItemResult(index=index, id=update.id, ok=False, error="No fields to update")
+        else:
+            operations.append(UpdateOne({"id": update.id}, {"$set": fields}))
+            operation_indexes.append(index)
+    
+    if operations:
+        failed = {}
+        try:
+            await db.meeting_profiles.bulk_write(operations, ordered=False)
+        except BulkWriteError as e:
+            failed = write_errors(e)
+        updated_ids = []
+        for position, index in enumerate(operation_indexes):
+            profile_id = updates[index].id
+            if position in failed:
+                results[index] = BulkItemResult(index=index, id=profile_id, ok=False, error=failed[position])
+            else:
+                results[index] = BulkItemResult(index=index, id=profile_id, ok=True)
+                updated_ids.append(profile_id)
+        if updated_ids:
+            await bump_change_version("meeting_profiles")
+            # Running chats keep the old persona until they are recreated
+            for session in await db.meeting_sessions.find({"profile_id": {"$in": updated_ids}}, {"_id": 0, "id": 1}).to_list(None):
+                chat_instances.pop(session["id"], None)
+    return bulk_result([results[i] for i in range(len(updates))])
+
+@api_router.post("/profiles/bulk-delete", response_model=BulkResult)
+async def delete_profiles_bulk(body: ProfileIds):
+    check_bulk_size(body.ids)
+    existing = {
+        profile["id"]
+        async for profile in db.meeting_profiles.find({"id": {"$in": body.ids}, "user_id": "default"}, {"_id": 0, "id": 1})
+    }
+    if existing:
+        await db.meeting_profiles.delete_many({"id": {"$in": list(existing)}})
+        await bump_change_version("meeting_profiles")
+    return bulk_result([
+        BulkItemResult(index=index, id=profile_id, ok=profile_id in existing, error=None if profile_id in existing else "Profile not found")
+        for index, profile_id in enumerate(body.ids)
+    ])
+
+@api_router.post("/sessions/bulk", response_model=BulkResult)
+async def create_sessions_bulk(sessions: List[MeetingSessionCreate]):
+    check_bulk_size(sessions)
+    # One query for every referenced profile instead of a find_one per session
+    profile_ids = list({session.profile_id for session in sessions})
+    known_profiles = {
+        profile["id"]
+        async for profile in db.meeting_profiles.find({"id": {"$in": profile_ids}}, {"_id": 0, "id": 1})
+    }
+    
+    results: Dict[int, BulkItemResult] = {}
+    docs = []
+    indexes = []
+    for index, session in enumerate(sessions):
+        if session.profile_id not in known_profiles:
+            results[index] = BulkItemResult(index=index, ok=False, error="Profile not found")
+        else:
+            docs.append(MeetingSession(**session.dict()).dict())
+            indexes.append(index)
+    
+    if docs and await insert_bulk(db.meeting_sessions, docs, indexes, results):
+        await bump_change_version("meeting_sessions")
+    return bulk_result([results[i] for i in range(len(sessions))])
+
+@api_router.put("/sessions/bulk-status")
+async def update_sessions_status_bulk(update: SessionBulkStatusUpdate):
+    matched, modified = await set_session_status(session_filter_query(update.filter), update.status)
+    return {"matched": matched, "modified": modified}
+
+@api_router.post("/sessions/bulk-delete")
+async def delete_sessions_bulk(session_filter: SessionFilter):
+    query = session_filter_query(session_filter)
+    sessions = await db.meeting_sessions.find(query, {"_id": 0, "id": 1, "archive_file": 1}).to_list(None)
+    session_ids = [session["id"] for session in sessions]
+    if not session_ids:
+        return {"deleted": 0, "ids": []}
+    
+    result = await db.meeting_sessions.delete_many({"id": {"$in": session_ids}})
+    await bump_change_version("meeting_sessions")
+    await unindex_sessions(session_ids)
+    for session in sessions:
+        chat_instances.pop(session["id"], None)
+        if session.get("archive_file"):
+            await asyncio.to_thread(archive_store.delete, session["archive_file"])
+    return {"deleted": result.deleted_count, "ids": session_ids}
+
 # Chat functionality
 @api_router.post("/sessions/{session_id}/chat", response_model=AIResponse)
 async def chat_with_ai(session_id: str, message: str):
@@ -188,6 +529,8 @@ async def chat_with_ai(session_id: str, message: str):
     session = await db.meeting_sessions.find_one({"id": session_id})
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
+    if session.get("archived"):
+        raise HTTPException(status_code=409, detail="Session is archived")
     
     profile = await db.meeting_profiles.find_one({"id": session["profile_id"]})
     if not profile:
@@ -208,10 +551,19 @@ async def chat_with_ai(session_id: str, message: str):
             "timestamp": datetime.utcnow().isoformat()
         }
         
-        await db.meeting_sessions.update_one(
-            {"id": session_id},
-            {"$push": {"conversation_history": conversation_entry}}
+        # The position comes from the write itself, so concurrent chats on one
+        # session cannot index their turns under each other's offsets
+        updated = await db.meeting_sessions.find_one_and_update(
+            {"id": session_id, "archived": {"$ne": True}},
+            {"$push": {"conversation_history": conversation_entry}},
+            projection={"_id": 0, "history_length": {"$size": "$conversation_history"}},
+            return_document=ReturnDocument.AFTER
         )
+        if updated is None:
+            # Archived or deleted while the response was being generated
+            raise HTTPException(status_code=409, detail="Session was archived or deleted")
+        await bump_change_version("meeting_sessions")
+        await index_turn(session_id, updated["history_length"] - 1, conversation_entry)
         
         return AIResponse(
             message=ai_response,
@@ -219,10 +571,327 @@ async def chat_with_ai(session_id: str, message: str):
             response_type="answer"
         )
     
+    except HTTPException:
+        raise
     except Exception as e:
         logging.error(f"Chat error: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to generate response")
 
+# Transcript export and archival
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+    "md": "text/markdown",
+}
+
+async def iter_session_turns(session: Dict[str, Any]):
+    """Yield a session's turns from its archive or, for live sessions, from a Mongo cursor"""
+    if session.get("archived"):
+        async for turn in iterate_in_threadpool(archive_store.iter_turns(session["archive_file"])):
+            yield turn
+        return
+    
+    # $unwind hands the history back in cursor batches rather than as one document
+    cursor = db.meeting_sessions.aggregate([
+        {"$match": {"id": session["id"]}},
+        {"$unwind": "$conversation_history"},
+        {"$replaceRoot": {"newRoot": "$conversation_history"}},
+    ])
+    async for turn in cursor:
+        turn.pop("_id", None)
+        yield turn
+
+def format_turn(fmt: str, offset: int, turn: Dict[str, Any]) -> str:
+    if fmt == "ndjson":
+        return json.dumps({"offset": offset, **turn}, default=str) + "\n"
+    if fmt == "csv":
+        buffer = io.StringIO()
+        csv.writer(buffer).writerow([offset, turn.get("timestamp", ""), turn.get("user_message", ""), turn.get("ai_response", "")])
+        return buffer.getvalue()
+    return (
+        f"### Turn {offset + 1} ({turn.get('timestamp', '')})\n\n"
+        f"**Participant:** {turn.get('user_message', '')}\n\n"
+        f"**Assistant:** {turn.get('ai_response', '')}\n\n"
+    )
+
+@api_router.get("/sessions/{session_id}/export")
+async def export_session(session_id: str, format: str = Query("ndjson", pattern="^(ndjson|csv|md)$")):
+    """Stream a session transcript, whether live or archived"""
+    session = await db.meeting_sessions.find_one(
+        {"id": session_id},
+        {"_id": 0, "id": 1, "title": 1, "archived": 1, "archive_file": 1}
+    )
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found")
+    
+    async def body():
+        if format == "csv":
+            yield "offset,timestamp,user_message,ai_response\r\n"
+        elif format == "md":
+            yield f"# {session['title']}\n\n"
+        offset = 0
+        async for turn in iter_session_turns(session):
+            yield format_turn(format, offset, turn)
+            offset += 1
+    
+    return StreamingResponse(
+        body(),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{session_id}.{format}"'}
+    )
+
+async def archive_session(session: Dict[str, Any]) -> bool:
+    history = session.pop("conversation_history", [])
+    session.pop("_id", None)
+    file_name = await asyncio.to_thread(archive_store.write, session, history)
+    
+    # Only replace the history if nothing was appended while the archive was
+    # written and no other archiver got there first
+    result = await db.meeting_sessions.update_one(
+        {"id": session["id"], "status": "ended", "archived": {"$ne": True}, "conversation_history": {"$size": len(history)}},
+        {"$set": {
+            "conversation_history": [],
+            "archived": True,
+            "archive_file": file_name,
+            "turn_count": len(history),
+        }}
+    )
+    if result.matched_count == 0:
+        # The file name is unique to this attempt, so this never removes the
+        # archive another attempt stored
+        await asyncio.to_thread(archive_store.delete, file_name)
+        return False
+    return True
+
+async def archive_ended_sessions() -> int:
+    """Move ended sessions older than ARCHIVE_AFTER_DAYS into the archive store"""
+    cutoff = datetime.utcnow() - timedelta(days=ARCHIVE_AFTER_DAYS)
+    query = {
+        "status": "ended",
+        "archived": {"$ne": True},
+        "$or": [
+            {"ended_at": {"$lt": cutoff}},
+            # Sessions ended before ended_at was recorded
+            {"ended_at": None, "created_at": {"$lt": cutoff}},
+        ],
+    }
+    archived = 0
+    async for session in db.meeting_sessions.find(query):
+        try:
+            if await archive_session(session):
+                archived += 1
+        except Exception as e:
+            logging.error(f"Archive error for session {session.get('id')}: {str(e)}")
+    if archived:
+        await bump_change_version("meeting_sessions")
+    return archived
+
+async def run_archiver():
+    while True:
+        try:
+            archived = await archive_ended_sessions()
+            if archived:
+                logger.info(f"Archived {archived} ended sessions")
+        except Exception as e:
+            logging.error(f"Archiver error: {str(e)}")
+        await asyncio.sleep(ARCHIVE_INTERVAL_SECONDS)
+
+# Offline transcript replay
+REPLAY_DIR = Path(os.environ.get('REPLAY_DIR', ROOT_DIR / 'replay_results'))
+replay_tasks = set()
+
+class StubLlmChat:
+    """Deterministic stand-in for LlmChat so replays can run offline"""
+    
+    def __init__(self, session_id: str, system_message: str, latency: float = 0.0):
+        self.session_id = session_id
+        self.system_message = system_message
+        self.latency = latency
+        self.turns = 0
+    
+    async def send_message(self, user_message: UserMessage) -> str:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        self.turns += 1
+        return f"Noted ({self.turns}): {user_message.text[:120]}"
+
+def estimate_tokens(text: Optional[str]) -> int:
+    # LlmChat does not report usage, so count roughly four characters per token
+    return (len(text) + 3) // 4 if text else 0
+
+def parse_transcripts(lines: Iterable[str], default_id: str = "transcript") -> Dict[str, List[Dict[str, str]]]:
+    """Group JSONL speaker/message records by their optional transcript_id"""
+    transcripts: Dict[str, List[Dict[str, str]]] = {}
+    for line_number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line:
+            continue
+        record = json.loads(line)
+        if not isinstance(record, dict) or "speaker" not in record or "message" not in record:
+            raise ValueError(f"Line {line_number}: expected an object with speaker and message")
+        transcript_id = str(record.get("transcript_id", default_id))
+        transcripts.setdefault(transcript_id, []).append({
+            "speaker": str(record["speaker"]),
+            "message": str(record["message"])
+        })
+    return transcripts
+
+async def replay_transcript(run_id: str, transcript_id: str, turns: List[Dict[str, str]], profile: MeetingProfile, llm_factory: Callable[[str, str], Any], write_result: Callable[[Dict[str, Any]], None]):
+    """Feed one transcript turn by turn through get_ai_chat, as the live websocket does"""
+    session_id = f"replay-{run_id}-{transcript_id}"
+    chat = await get_ai_chat(session_id, profile, llm_factory)
+    try:
+        for turn_index, turn in enumerate(turns):
+            prompt = f"{turn['speaker']}: {turn['message']}"
+            response, error = None, None
+            started = time.perf_counter()
+            try:
+                response = await chat.send_message(UserMessage(text=prompt))
+            except Exception as e:
+                error = str(e)
+            write_result({
+                "transcript_id": transcript_id,
+                "turn": turn_index,
+                "speaker": turn["speaker"],
+                "message": turn["message"],
+                "response": response,
+                "error": error,
+                "latency_ms": round((time.perf_counter() - started) * 1000, 3),
+                "prompt_tokens": estimate_tokens(prompt),
+                "completion_tokens": estimate_tokens(response),
+            })
+    finally:
+        chat_instances.pop(session_id, None)
+
+async def run_replay(transcripts: Dict[str, List[Dict[str, str]]], profile: MeetingProfile, results_file: TextIO, concurrency: int = 8, llm_factory: Callable[[str, str], Any] = gemini_chat, run_id: Optional[str] = None) -> Dict[str, Any]:
+    """Replay transcripts with at most ``concurrency`` running at once, writing JSONL results"""
+    if concurrency < 1:
+        # A zero semaphore would never let a transcript start
+        raise ValueError(f"concurrency must be at least 1, got {concurrency}")
+    run_id = run_id or str(uuid.uuid4())
+    semaphore = asyncio.Semaphore(concurrency)
+    totals = {"turns": 0, "errors": 0, "latency_ms": 0.0, "prompt_tokens": 0, "completion_tokens": 0}
+    
+    def write_result(result: Dict[str, Any]):
+        results_file.write(json.dumps(result) + "\n")
+        totals["turns"] += 1
+        totals["errors"] += result["error"] is not None
+        totals["latency_ms"] += result["latency_ms"]
+        totals["prompt_tokens"] += result["prompt_tokens"]
+        totals["completion_tokens"] += result["completion_tokens"]
+    
+    async def run_one(transcript_id: str, turns: List[Dict[str, str]]):
+        async with semaphore:
+            await replay_transcript(run_id, transcript_id, turns, profile, llm_factory, write_result)
+    
+    started = time.perf_counter()
+    await asyncio.gather(*(run_one(transcript_id, turns) for transcript_id, turns in transcripts.items()))
+    elapsed = time.perf_counter() - started
+    
+    return {
+        "transcripts": len(transcripts),
+        "turns": totals["turns"],
+        "errors": totals["errors"],
+        "elapsed_seconds": round(elapsed, 3),
+        "turns_per_second": round(totals["turns"] / elapsed, 2) if elapsed else None,
+        "mean_latency_ms": round(totals["latency_ms"] / totals["turns"], 3) if totals["turns"] else None,
+        "prompt_tokens": totals["prompt_tokens"],
+        "completion_tokens": totals["completion_tokens"],
+    }
+
+async def run_replay_job(job: ReplayJob, transcripts: Dict[str, List[Dict[str, str]]], profile: MeetingProfile, llm_factory: Callable[[str, str], Any]):
+    await db.replay_jobs.update_one({"id": job.id}, {"$set": {"status": "running"}})
+    try:
+        REPLAY_DIR.mkdir(parents=True, exist_ok=True)
+        with open(REPLAY_DIR / f"{job.id}.jsonl", "w") as results_file:
+            summary = await run_replay(transcripts, profile, results_file, job.concurrency, llm_factory, job.id)
+        await db.replay_jobs.update_one({"id": job.id}, {"$set": {"status": "completed", "summary": summary}})
+    except Exception as e:
+        logging.error(f"Replay job {job.id} failed: {str(e)}")
+        await db.replay_jobs.update_one({"id": job.id}, {"$set": {"status": "failed", "error": str(e)}})
+
+@api_router.post("/replay/jobs", response_model=ReplayJob)
+async def create_replay_job(
+    profile_id: str = Form(...),
+    transcripts_file: UploadFile = File(...),
+    concurrency: int = Form(8, ge=1, le=64),
+    stub: bool = Form(False),
+    stub_latency_ms: float = Form(0.0, ge=0)
+):
+    """Start replaying a JSONL transcript file against a profile in the background"""
+    profile = await db.meeting_profiles.find_one({"id": profile_id})
+    if not profile:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    
+    content = await transcripts_file.read()
+    try:
+        transcripts = parse_transcripts(content.decode("utf-8").splitlines(), default_id=transcripts_file.filename or "transcript")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid transcript file: {str(e)}")
+    if not transcripts:
+        raise HTTPException(status_code=400, detail="Transcript file is empty")
+    
+    job = ReplayJob(
+        profile_id=profile_id,
+        stub=stub,
+        concurrency=concurrency,
+        transcripts=len(transcripts),
+        turns=sum(len(turns) for turns in transcripts.values())
+    )
+    await db.replay_jobs.insert_one(job.dict())
+    
+    if stub:
+        llm_factory = lambda session_id, system_message: StubLlmChat(session_id, system_message, stub_latency_ms / 1000)
+    else:
+        llm_factory = gemini_chat
+    task = asyncio.create_task(run_replay_job(job, transcripts, MeetingProfile(**profile), llm_factory))
+    replay_tasks.add(task)
+    task.add_done_callback(replay_tasks.discard)
+    return job
+
+@api_router.get("/replay/jobs/{job_id}", response_model=ReplayJob)
+async def get_replay_job(job_id: str):
+    job = await db.replay_jobs.find_one({"id": job_id})
+    if not job:
+        raise HTTPException(status_code=404, detail="Replay job not found")
+    return ReplayJob(**job)
+
+@api_router.get("/replay/jobs/{job_id}/results")
+async def get_replay_results(job_id: str):
+    job = await db.replay_jobs.find_one({"id": job_id}, {"_id": 0, "status": 1})
+    if not job:
+        raise HTTPException(status_code=404, detail="Replay job not found")
+    if job["status"] != "completed":
+        raise HTTPException(status_code=409, detail=f"Replay job is {job['status']}")
+    return FileResponse(REPLAY_DIR / f"{job_id}.jsonl", media_type="application/x-ndjson", filename=f"replay-{job_id}.jsonl")
+
+# Transcript search
+@api_router.get("/search", response_model=SearchResults)
+async def search_transcripts(q: str = Query(..., min_length=1, max_length=SEARCH_MAX_QUERY_LENGTH), limit: int = Query(20, ge=1, le=100), offset: int = Query(0, ge=0)):
+    """Ranked full-text search over conversation turns of all sessions"""
+    if len(set(tokenize(q))) > SEARCH_MAX_TERMS:
+        raise HTTPException(status_code=400, detail=f"Search query has more than {SEARCH_MAX_TERMS} distinct terms")
+    if search_index_state == "failed":
+        raise HTTPException(status_code=503, detail="Search index build failed, retrying", headers={"Retry-After": str(SEARCH_INDEX_RETRY_SECONDS)})
+    if search_index_state != "ready":
+        raise HTTPException(status_code=503, detail="Search index is warming up", headers={"Retry-After": "5"})
+    total, hits = await asyncio.to_thread(search_index.search, q, limit, offset)
+    
+    # One lookup for the titles of every session on this page
+    session_ids = list({hit["session_id"] for hit in hits})
+    titles = {}
+    if session_ids:
+        async for session in db.meeting_sessions.find({"id": {"$in": session_ids}}, {"_id": 0, "id": 1, "title": 1}):
+            titles[session["id"]] = session.get("title")
+    
+    return SearchResults(
+        query=q,
+        total=total,
+        limit=limit,
+        offset=offset,
+        hits=[SearchHit(session_title=titles.get(hit["session_id"]), **hit) for hit in hits]
+    )
+
 # Voice functionality (basic)
 @api_router.post("/voice/upload", response_model=VoiceProfile)
 async def upload_voice(name: str = Form(...), audio_file: UploadFile = File(...)):
@@ -239,6 +908,7 @@ async def upload_voice(name: str = Form(...), audio_file: UploadFile = File(...)
         )
         
         await db.voice_profiles.insert_one(voice_profile.dict())
+        await bump_change_version("voice_profiles")
         return voice_profile
     
     except Exception as e:
@@ -246,9 +916,12 @@ async def upload_voice(name: str = Form(...), audio_file: UploadFile = File(...)
         raise HTTPException(status_code=500, detail="Failed to upload voice")
 
 @api_router.get("/voice/profiles", response_model=List[VoiceProfile])
-async def get_voice_profiles():
-    profiles = await db.voice_profiles.find({"user_id": "default"}).to_list(10)
-    return [VoiceProfile(**profile) for profile in profiles]
+async def get_voice_profiles(request: Request):
+    etag, not_modified = await check_etag(request, "voice_profiles")
+    if not_modified:
+        return not_modified
+    profiles = await db.voice_profiles.find({"user_id": "default"}, VOICE_PROFILE_PROJECTION).to_list(10)
+    return ORJSONResponse(profiles, headers=etag_headers(etag))
 
 @api_router.post("/voice/synthesize")
 async def synthesize_voice(text: str, voice_profile_id: Optional[str] = None):
@@ -340,6 +1013,78 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+async def build_search_index():
+    global search_index_state
+    indexed_lengths: Dict[str, int] = {}
+    cursor = db.meeting_sessions.find({}, {"_id": 0, "id": 1, "conversation_history": 1, "archived": 1, "archive_file": 1})
+    async for session in cursor:
+        if session.get("archived"):
+            try:
+                turns = await asyncio.to_thread(lambda: list(archive_store.iter_turns(session["archive_file"])))
+            except OSError as e:
+                logging.error(f"Cannot index archive of session {session['id']}: {str(e)}")
+                continue
+        else:
+            turns = session.get("conversation_history", [])
+        # Tokenizing is CPU work; keep it off the event loop
+        await asyncio.to_thread(search_index.add_session, session["id"], turns)
+        indexed_lengths[session["id"]] = len(turns)
+    
+    # Deletes may keep arriving while earlier ones are applied
+    removed = set()
+    while pending_index_removals:
+        session_ids = pending_index_removals[:]
+        pending_index_removals.clear()
+        removed.update(session_ids)
+        await asyncio.to_thread(search_index.remove_sessions, session_ids)
+    
+    # No awaits from here on, so nothing can be queued after the flag flips.
+    # Turns at offsets the build already read were indexed from Mongo.
+    for session_id, offset, entry in pending_index_turns:
+        if session_id not in removed and offset >= indexed_lengths.get(session_id, 0):
+            search_index.add_turn(session_id, offset, turn_text(entry))
+    pending_index_turns.clear()
+    search_index_state = "ready"
+    logger.info(f"Search index built with {len(search_index)} turns")
+
+async def run_search_index_build():
+    global search_index, search_index_state
+    delay = SEARCH_INDEX_RETRY_SECONDS
+    while True:
+        # Start each attempt from an empty index so a partial build is dropped
+        search_index = TurnSearchIndex()
+        search_index_state = "warming"
+        try:
+            await build_search_index()
+            return
+        except Exception as e:
+            logging.error(f"Search index build failed, retrying in {delay}s: {str(e)}")
+            search_index_state = "failed"
+            pending_index_turns.clear()
+            pending_index_removals.clear()
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, SEARCH_INDEX_MAX_RETRY_SECONDS)
+
+@app.on_event("startup")
+async def backfill_session_fields():
+    # Read endpoints serialize stored documents as-is, so sessions created
+    # before these fields existed get their defaults written once
+    for field, default in (("ended_at", None), ("archived", False), ("turn_count", None)):
+        await db.meeting_sessions.update_many({field: {"$exists": False}}, {"$set": {field: default}})
+
+@app.on_event("startup")
+async def start_search_index_build():
+    global search_index_task
+    search_index_task = asyncio.create_task(run_search_index_build())
+
+@app.on_event("startup")
+async def start_archiver():
+    global archiver_task
+    archiver_task = asyncio.create_task(run_archiver())
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    for task in (search_index_task, archiver_task):
+        if task:
+            task.cancel()
     client.close()
\ No newline at end of file
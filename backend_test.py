@@ -12,6 +12,7 @@ import websockets
 import base64
 import io
 import time
+import uuid
 from datetime import datetime
 from typing import Dict, Any, List
 
@@ -26,6 +27,9 @@ class BackendTester:
         self.created_profiles = []
         self.created_sessions = []
         self.created_voice_profiles = []
+        self.chat_session_id = None
+        # Unique word in the chat test message, searched for by the search test
+        self.chat_marker = f"kickoff{uuid.uuid4().hex[:8]}"
 
     def log_result(self, test_name: str, success: bool, message: str, details: Any = None):
         """Log test result"""
@@ -143,7 +147,7 @@ class BackendTester:
             self.created_sessions.append(session_id)
             
             # Test chat functionality
-            test_message = "Hello, can you introduce yourself and tell us about your role in this meeting?"
+            test_message = f"Hello, can you introduce yourself and tell us about your role in this {self.chat_marker} meeting?"
             
             # Note: The chat endpoint expects form data, not JSON
             chat_response = self.session.post(
@@ -156,6 +160,7 @@ class BackendTester:
                 return False
             
             ai_response = chat_response.json()
+            self.chat_session_id = session_id
             
             # Verify response structure
             required_fields = ["message", "confidence", "response_type"]
@@ -176,6 +181,235 @@ class BackendTester:
             self.log_result("Gemini AI Integration", False, f"Exception: {str(e)}")
             return False
 
+    def test_transcript_search(self):
+        """Test 7: Transcript Search - GET /api/search"""
+        try:
+            if not self.chat_session_id:
+                self.log_result("Transcript Search", False, "No chat turn available for testing")
+                return False
+            
+            # The index may still be warming right after a deploy
+            response = None
+            for _ in range(10):
+                response = self.session.get(f"{BASE_URL}/search", params={"q": self.chat_marker, "limit": 5})
+                if response.status_code != 503:
+                    break
+                time.sleep(2)
+            if response.status_code != 200:
+                self.log_result("Transcript Search", False, f"Search failed: HTTP {response.status_code}", response.text)
+                return False
+            
+            results = response.json()
+            required_fields = ["query", "total", "limit", "offset", "hits"]
+            missing_fields = [field for field in required_fields if field not in results]
+            if missing_fields:
+                self.log_result("Transcript Search", False, f"Missing fields: {missing_fields}")
+                return False
+            
+            if results["total"] != 1 or len(results["hits"]) != 1:
+                self.log_result("Transcript Search", False, f"Expected exactly one hit for {self.chat_marker}", results)
+                return False
+            
+            # The hit must point at the turn that contains the word
+            hit = results["hits"][0]
+            if hit["session_id"] != self.chat_session_id:
+                self.log_result("Transcript Search", False, "Hit points at the wrong session", hit)
+                return False
+            
+            session = self.session.get(f"{BASE_URL}/sessions/{hit['session_id']}").json()
+            history = session.get("conversation_history", [])
+            if hit["turn_offset"] >= len(history) or self.chat_marker not in history[hit["turn_offset"]]["user_message"]:
+                self.log_result("Transcript Search", False, "Hit turn_offset does not point at the matching turn", hit)
+                return False
+            
+            # Empty queries are rejected
+            empty_response = self.session.get(f"{BASE_URL}/search", params={"q": ""})
+            if empty_response.status_code != 422:
+                self.log_result("Transcript Search", False, f"Empty query returned HTTP {empty_response.status_code}")
+                return False
+            
+            self.log_result("Transcript Search", True, f"Search found the chat turn at offset {hit['turn_offset']}")
+            return True
+            
+        except Exception as e:
+            self.log_result("Transcript Search", False, f"Exception: {str(e)}")
+            return False
+
+    def test_conditional_get(self):
+        """Test 8: Conditional GET - ETag / If-None-Match on list endpoints"""
+        try:
+            for path in ["/profiles", "/sessions", "/voice/profiles"]:
+                first = self.session.get(f"{BASE_URL}{path}")
+                etag = first.headers.get("ETag")
+                if first.status_code != 200 or not etag:
+                    self.log_result("Conditional GET", False, f"{path} returned no ETag: HTTP {first.status_code}")
+                    return False
+                
+                cached = self.session.get(f"{BASE_URL}{path}", headers={"If-None-Match": etag})
+                if cached.status_code != 304:
+                    self.log_result("Conditional GET", False, f"{path} with matching ETag returned HTTP {cached.status_code}")
+                    return False
+            
+            # A write must invalidate the profiles ETag
+            etag = self.session.get(f"{BASE_URL}/profiles").headers.get("ETag")
+            profile_data = {
+                "name": "ETag Probe",
+                "role": "Observer",
+                "personality": "Quiet",
+                "response_style": "Brief"
+            }
+            create_response = self.session.post(f"{BASE_URL}/profiles", json=profile_data)
+            if create_response.status_code == 200:
+                self.created_profiles.append(create_response.json()["id"])
+            
+            refreshed = self.session.get(f"{BASE_URL}/profiles", headers={"If-None-Match": etag})
+            if refreshed.status_code != 200 or refreshed.headers.get("ETag") == etag:
+                self.log_result("Conditional GET", False, f"ETag not invalidated after create: HTTP {refreshed.status_code}")
+                return False
+            
+            self.log_result("Conditional GET", True, "Unchanged lists return 304 and writes invalidate the ETag")
+            return True
+            
+        except Exception as e:
+            self.log_result("Conditional GET", False, f"Exception: {str(e)}")
+            return False
+
+    def test_bulk_operations(self):
+        """Test 9: Bulk Operations - batch create, update and delete"""
+        try:
+            profiles_data = [
+                {
+                    "name": f"Bulk Assistant {i}",
+                    "role": "Engineer",
+                    "personality": "Direct",
+                    "response_style": "Short"
+                }
+                for i in range(3)
+            ]
+            create_response = self.session.post(f"{BASE_URL}/profiles/bulk", json=profiles_data)
+            if create_response.status_code != 200:
+                self.log_result("Bulk Operations", False, f"Bulk profile create failed: HTTP {create_response.status_code}", create_response.text)
+                return False
+            
+            created = create_response.json()
+            if created["succeeded"] != 3:
+                self.log_result("Bulk Operations", False, "Not all profiles were created", created)
+                return False
+            profile_ids = [result["id"] for result in created["results"]]
+            self.created_profiles.extend(profile_ids)
+            
+            # One unknown profile id must fail only its own item
+            sessions_data = [{"title": f"Bulk Meeting {i}", "profile_id": profile_ids[i]} for i in range(3)]
+            sessions_data.append({"title": "Orphan Meeting", "profile_id": "does-not-exist"})
+            sessions_response = self.session.post(f"{BASE_URL}/sessions/bulk", json=sessions_data)
+            sessions_result = sessions_response.json()
+            if sessions_response.status_code != 200 or sessions_result["succeeded"] != 3 or sessions_result["results"][3]["ok"]:
+                self.log_result("Bulk Operations", False, "Unexpected bulk session result", sessions_result)
+                return False
+            session_ids = [result["id"] for result in sessions_result["results"][:3]]
+            
+            status_response = self.session.put(
+                f"{BASE_URL}/sessions/bulk-status",
+                json={"filter": {"ids": session_ids}, "status": "ended"}
+            )
+            if status_response.status_code != 200 or status_response.json()["matched"] != 3:
+                self.log_result("Bulk Operations", False, "Bulk status update failed", status_response.text)
+                return False
+            
+            delete_response = self.session.post(f"{BASE_URL}/sessions/bulk-delete", json={"ids": session_ids})
+            if delete_response.status_code != 200 or delete_response.json()["deleted"] != 3:
+                self.log_result("Bulk Operations", False, "Bulk session delete failed", delete_response.text)
+                return False
+            
+            self.log_result("Bulk Operations", True, "Bulk create, status update and delete successful")
+            return True
+            
+        except Exception as e:
+            self.log_result("Bulk Operations", False, f"Exception: {str(e)}")
+            return False
+
+    def test_transcript_export(self):
+        """Test 10: Transcript Export - GET /api/sessions/{id}/export"""
+        try:
+            if not self.created_sessions:
+                self.log_result("Transcript Export", False, "No sessions available for testing")
+                return False
+            
+            session_id = self.created_sessions[0]
+            expected_types = {"ndjson": "application/x-ndjson", "csv": "text/csv", "md": "text/markdown"}
+            for fmt, media_type in expected_types.items():
+                response = self.session.get(f"{BASE_URL}/sessions/{session_id}/export", params={"format": fmt})
+                if response.status_code != 200 or not response.headers.get("content-type", "").startswith(media_type):
+                    self.log_result("Transcript Export", False, f"{fmt} export failed: HTTP {response.status_code}", response.text)
+                    return False
+            
+            lines = self.session.get(f"{BASE_URL}/sessions/{session_id}/export", params={"format": "ndjson"}).text.splitlines()
+            for line in lines:
+                turn = json.loads(line)
+                if "offset" not in turn or "user_message" not in turn:
+                    self.log_result("Transcript Export", False, "Malformed ndjson turn", line)
+                    return False
+            
+            bad_response = self.session.get(f"{BASE_URL}/sessions/{session_id}/export", params={"format": "xml"})
+            if bad_response.status_code != 422:
+                self.log_result("Transcript Export", False, f"Unknown format returned HTTP {bad_response.status_code}")
+                return False
+            
+            self.log_result("Transcript Export", True, f"Exported {len(lines)} turns in ndjson, csv and md")
+            return True
+            
+        except Exception as e:
+            self.log_result("Transcript Export", False, f"Exception: {str(e)}")
+            return False
+
+    def test_replay_job(self):
+        """Test 11: Replay Job - offline transcript replay with the stub LLM"""
+        try:
+            if not self.created_profiles:
+                self.log_result("Replay Job", False, "No profiles available for testing")
+                return False
+            
+            transcript_lines = [
+                {"transcript_id": f"standup-{m}", "speaker": speaker, "message": message}
+                for m in range(3)
+                for speaker, message in [("Host", "Any blockers this week?"), ("Dana", "The release is waiting on QA.")]
+            ]
+            transcript_file = io.BytesIO("\n".join(json.dumps(line) for line in transcript_lines).encode("utf-8"))
+            
+            create_response = self.session.post(
+                f"{BASE_URL}/replay/jobs",
+                data={"profile_id": self.created_profiles[0], "stub": "true", "concurrency": "2"},
+                files={"transcripts_file": ("standups.jsonl", transcript_file, "application/x-ndjson")}
+            )
+            if create_response.status_code != 200:
+                self.log_result("Replay Job", False, f"Job creation failed: HTTP {create_response.status_code}", create_response.text)
+                return False
+            
+            job_id = create_response.json()["id"]
+            job = {}
+            for _ in range(10):
+                job = self.session.get(f"{BASE_URL}/replay/jobs/{job_id}").json()
+                if job.get("status") in ("completed", "failed"):
+                    break
+                time.sleep(1)
+            
+            if job.get("status") != "completed" or job["summary"]["turns"] != len(transcript_lines):
+                self.log_result("Replay Job", False, "Replay job did not complete", job)
+                return False
+            
+            results_response = self.session.get(f"{BASE_URL}/replay/jobs/{job_id}/results")
+            results = [json.loads(line) for line in results_response.text.splitlines()]
+            if len(results) != len(transcript_lines) or any("latency_ms" not in result for result in results):
+                self.log_result("Replay Job", False, "Unexpected replay results", results_response.text[:500])
+                return False
+            
+            self.log_result("Replay Job", True, f"Replayed {len(results)} turns at {job['summary']['turns_per_second']} turns/s")
+            return True
+            
+        except Exception as e:
+            self.log_result("Replay Job", False, f"Exception: {str(e)}")
+            return False
+
     def test_meeting_session_management(self):
         """Test 4: Meeting Session Management - CRUD operations"""
         try:
@@ -380,8 +614,13 @@ class BackendTester:
             self.test_basic_api_connectivity,
             self.test_meeting_profile_crud,
             self.test_gemini_ai_integration,
+            self.test_transcript_search,
+            self.test_transcript_export,
             self.test_meeting_session_management,
-            self.test_voice_profile_upload
+            self.test_voice_profile_upload,
+            self.test_conditional_get,
+            self.test_bulk_operations,
+            self.test_replay_job
         ]
         
         results = []
@@ -13,7 +13,8 @@ import {
   Square,
   Upload,
   Brain,
-  Users
+  Users,
+  Download
 } from "lucide-react";
 
 const BACKEND_URL = process.env.REACT_APP_BACKEND_URL;
@@ -559,12 +560,26 @@ function App() {
                           }`}>
                             {session.status}
                           </span>
+                          {session.archived && (
+                            <span className="ml-2 px-2 py-1 rounded text-xs bg-yellow-100 text-yellow-800">
+                              archived
+                            </span>
+                          )}
                         </p>
                       </div>
                       <div className="flex items-center gap-2">
                         <span className="text-sm text-gray-600">
-                          {session.conversation_history?.length || 0} messages
+                          {session.turn_count ?? session.conversation_history?.length ?? 0} messages
                         </span>
+                        {session.archived && (
+                          <a
+                            href={`${API}/sessions/${session.id}/export?format=md`}
+                            className="text-sm text-blue-600 hover:text-blue-800 flex items-center gap-1"
+                          >
+                            <Download size={16} />
+                            Export
+                          </a>
+                        )}
                       </div>
                     </div>
                   </div>
@@ -0,0 +1,39 @@
+from archive_store import ArchiveStore
+
+
+def test_write_and_iter_turns_round_trip(tmp_path):
+    store = ArchiveStore(tmp_path)
+    turns = [
+        {"user_message": "budget, please", "ai_response": "Sure.", "timestamp": "2025-01-01T10:00:00"},
+        {"user_message": "ünïcode ✓", "ai_response": "line\nbreak", "timestamp": "2025-01-01T10:00:20"},
+    ]
+
+    file_name = store.write({"id": "s1", "title": "Sync"}, iter(turns))
+
+    assert file_name.startswith("s1-") and file_name.endswith(".ndjson.gz")
+    assert list(store.iter_turns(file_name)) == turns
+    # Written through a temp file that is renamed into place
+    assert [p.name for p in tmp_path.iterdir()] == [file_name]
+
+
+def test_each_write_gets_its_own_file(tmp_path):
+    store = ArchiveStore(tmp_path)
+    first = store.write({"id": "s1"}, [])
+    second = store.write({"id": "s1"}, [])
+    assert first != second
+    store.delete(second)
+    assert [p.name for p in tmp_path.iterdir()] == [first]
+
+
+def test_write_without_turns(tmp_path):
+    store = ArchiveStore(tmp_path)
+    file_name = store.write({"id": "empty"}, [])
+    assert list(store.iter_turns(file_name)) == []
+
+
+def test_delete_is_idempotent(tmp_path):
+    store = ArchiveStore(tmp_path)
+    file_name = store.write({"id": "s1"}, [])
+    store.delete(file_name)
+    store.delete(file_name)
+    assert not any(tmp_path.iterdir())
@@ -0,0 +1,65 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("emergentintegrations")
+mongomock_motor = pytest.importorskip("mongomock_motor")
+
+from fastapi.testclient import TestClient
+
+import server
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(server, "db", mongomock_motor.AsyncMongoMockClient()["bulk_test"])
+    return TestClient(server.app)
+
+
+def create_profiles(client: TestClient, *names: str) -> list:
+    response = client.post("/api/profiles/bulk", json=[
+        {"name": name, "role": "PM", "personality": "calm", "response_style": "brief"}
+        for name in names
+    ])
+    assert response.status_code == 200
+    return [result["id"] for result in response.json()["results"]]
+
+
+def test_bulk_update_rejects_null_fields(client):
+    first, second = create_profiles(client, "First", "Second")
+
+    response = client.patch("/api/profiles/bulk", json=[
+        {"id": first, "name": None, "role": "CTO"},
+        {"id": second, "role": "CTO"},
+    ])
+    body = response.json()
+    assert (body["succeeded"], body["failed"]) == (1, 1)
+    assert body["results"][0] == {"index": 0, "id": first, "ok": False, "error": "Fields cannot be null: name"}
+    assert body["results"][1]["ok"] is True
+
+    response = client.get("/api/profiles")
+    assert response.status_code == 200
+    profiles = {profile["id"]: profile for profile in response.json()}
+    assert profiles[first]["name"] == "First"
+    assert profiles[first]["role"] == "PM"
+    assert profiles[second]["role"] == "CTO"
+
+
+def test_bulk_update_reports_write_errors_per_item(client):
+    first, second, third = create_profiles(client, "First", "Second", "Third")
+    asyncio.run(server.db.meeting_profiles.create_index("name", unique=True))
+
+    response = client.patch("/api/profiles/bulk", json=[
+        {"id": first, "role": "CTO"},
+        {"id": second, "name": "Third"},
+        {"id": third, "role": "CFO"},
+    ])
+    body = response.json()
+    assert (body["succeeded"], body["failed"]) == (2, 1)
+    assert [result["ok"] for result in body["results"]] == [True, False, True]
+    assert body["results"][1]["id"] == second
+    assert body["results"][1]["error"]
+
+    profiles = {profile["id"]: profile for profile in client.get("/api/profiles").json()}
+    assert profiles[second]["name"] == "Second"
+    assert profiles[third]["role"] == "CFO"
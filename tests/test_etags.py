@@ -0,0 +1,57 @@
+import pytest
+
+pytest.importorskip("emergentintegrations")
+mongomock_motor = pytest.importorskip("mongomock_motor")
+
+from fastapi.testclient import TestClient
+
+import server
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(server, "db", mongomock_motor.AsyncMongoMockClient()["etag_test"])
+    return TestClient(server.app)
+
+
+def create_profile(client: TestClient, name: str) -> dict:
+    response = client.post("/api/profiles", json={"name": name, "role": "PM", "personality": "calm", "response_style": "brief"})
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_list_etag_changes_after_write(client):
+    create_profile(client, "First")
+    response = client.get("/api/profiles")
+    etag = response.headers["ETag"]
+    assert response.headers["Cache-Control"] == "no-cache"
+
+    response = client.get("/api/profiles", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert response.content == b""
+    assert client.get("/api/profiles", headers={"If-None-Match": f"W/{etag}"}).status_code == 304
+
+    create_profile(client, "Second")
+    response = client.get("/api/profiles", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert len(response.json()) == 2
+
+
+def test_item_etag(client):
+    profile = create_profile(client, "First")
+    list_etag = client.get("/api/profiles").headers["ETag"]
+
+    response = client.get(f"/api/profiles/{profile['id']}")
+    etag = response.headers["ETag"]
+    assert etag != list_etag
+    assert client.get(f"/api/profiles/{profile['id']}", headers={"If-None-Match": etag}).status_code == 304
+    # A list tag never validates a single item
+    assert client.get(f"/api/profiles/{profile['id']}", headers={"If-None-Match": list_etag}).status_code == 200
+
+
+def test_missing_item_with_wildcard_is_not_found(client):
+    create_profile(client, "First")
+    response = client.get("/api/profiles/missing", headers={"If-None-Match": "*"})
+    assert response.status_code == 404
@@ -0,0 +1,142 @@
+import argparse
+import asyncio
+import io
+import json
+import sys
+
+import pytest
+
+pytest.importorskip("emergentintegrations")
+
+import replay
+import server
+from server import StubLlmChat, estimate_tokens, parse_transcripts, run_replay
+
+PROFILE = server.MeetingProfile(name="Ada", role="PM", personality="calm", response_style="brief")
+
+
+def transcript(*messages):
+    return [{"speaker": "Bob", "message": message} for message in messages]
+
+
+def replay_rows(transcripts, concurrency=8, llm_factory=None):
+    results_file = io.StringIO()
+    summary = asyncio.run(run_replay(
+        transcripts,
+        PROFILE,
+        results_file,
+        concurrency,
+        llm_factory or (lambda session_id, system_message: StubLlmChat(session_id, system_message)),
+    ))
+    return summary, [json.loads(line) for line in results_file.getvalue().splitlines()]
+
+
+def test_parse_transcripts_groups_by_transcript_id():
+    lines = [
+        '{"speaker": "Bob", "message": "hi"}',
+        "",
+        '{"transcript_id": "other", "speaker": "Eve", "message": "hello"}',
+        '{"speaker": "Bob", "message": 42}',
+    ]
+    assert parse_transcripts(lines, default_id="meeting") == {
+        "meeting": [{"speaker": "Bob", "message": "hi"}, {"speaker": "Bob", "message": "42"}],
+        "other": [{"speaker": "Eve", "message": "hello"}],
+    }
+
+
+def test_parse_transcripts_rejects_bad_lines():
+    with pytest.raises(ValueError, match="Line 2"):
+        parse_transcripts(['{"speaker": "Bob", "message": "hi"}', '{"speaker": "Bob"}'])
+    with pytest.raises(ValueError):
+        parse_transcripts(["not json"])
+
+
+def test_shard_balances_turns():
+    transcripts = {
+        "a": transcript(*"123456"),
+        "b": transcript(*"1234"),
+        "c": transcript(*"123"),
+        "d": transcript(*"12"),
+        "e": transcript("1"),
+    }
+    shards = replay.shard(transcripts, 2)
+
+    assert sorted(tid for s in shards for tid in s) == sorted(transcripts)
+    assert sorted(sum(len(turns) for turns in s.values()) for s in shards) == [8, 8]
+    # Never more shards than transcripts
+    assert len(replay.shard({"a": transcript("1")}, 4)) == 1
+
+
+def test_run_replay_bounds_concurrency():
+    active = 0
+    peak = 0
+
+    class TrackingChat(StubLlmChat):
+        async def send_message(self, user_message):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            try:
+                await asyncio.sleep(0.01)
+                return await super().send_message(user_message)
+            finally:
+                active -= 1
+
+    transcripts = {f"t{i}": transcript("one", "two") for i in range(6)}
+    summary, rows = replay_rows(transcripts, concurrency=2, llm_factory=TrackingChat)
+
+    assert peak == 2
+    assert summary["transcripts"] == 6
+    assert len(rows) == summary["turns"] == 12
+    # Chat instances are released once each transcript finishes
+    assert not any(session_id.startswith("replay-") for session_id in server.chat_instances)
+
+
+def test_run_replay_summary_math():
+    transcripts = {"a": transcript("budget first", "then hiring"), "b": transcript("launch date?")}
+    # Enough stub latency that elapsed time is measurable at millisecond rounding
+    summary, rows = replay_rows(transcripts, llm_factory=lambda session_id, system_message: StubLlmChat(session_id, system_message, 0.02))
+
+    assert summary["turns"] == 3
+    assert summary["errors"] == 0
+    assert [(row["transcript_id"], row["turn"]) for row in sorted(rows, key=lambda r: (r["transcript_id"], r["turn"]))] == [
+        ("a", 0), ("a", 1), ("b", 0)
+    ]
+    assert summary["prompt_tokens"] == sum(estimate_tokens(f"Bob: {row['message']}") for row in rows)
+    assert summary["prompt_tokens"] == sum(row["prompt_tokens"] for row in rows)
+    assert summary["completion_tokens"] == sum(estimate_tokens(row["response"]) for row in rows)
+    assert summary["mean_latency_ms"] == pytest.approx(sum(row["latency_ms"] for row in rows) / 3, abs=1e-3)
+    assert summary["turns_per_second"] == pytest.approx(3 / summary["elapsed_seconds"], rel=0.05)
+
+
+def test_run_replay_records_errors_and_continues():
+    class FlakyChat(StubLlmChat):
+        async def send_message(self, user_message):
+            if "fail" in user_message.text:
+                raise RuntimeError("quota exceeded")
+            return await super().send_message(user_message)
+
+    summary, rows = replay_rows({"a": transcript("ok", "please fail", "ok again")}, llm_factory=FlakyChat)
+
+    assert summary["turns"] == 3
+    assert summary["errors"] == 1
+    failed = [row for row in rows if row["error"]]
+    assert failed == [dict(failed[0], turn=1, response=None, error="quota exceeded", completion_tokens=0)]
+    assert [row["response"] is not None for row in rows] == [True, False, True]
+
+
+def test_run_replay_rejects_concurrency_below_one():
+    with pytest.raises(ValueError):
+        replay_rows({"a": transcript("hi")}, concurrency=0)
+
+
+def test_cli_rejects_concurrency_below_one(monkeypatch, capsys):
+    with pytest.raises(argparse.ArgumentTypeError):
+        replay.positive_int("0")
+    assert replay.positive_int("3") == 3
+
+    monkeypatch.setattr(sys, "argv", ["replay.py", "t.jsonl", "--profile", "p.json", "--concurrency", "0"])
+    with pytest.raises(SystemExit) as exit_info:
+        replay.main()
+    assert exit_info.value.code == 2
+    assert "must be at least 1" in capsys.readouterr().err
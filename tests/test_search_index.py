@@ -0,0 +1,53 @@
+from search_index import TurnSearchIndex, tokenize
+
+
+def turns(*messages):
+    return [{"user_message": message, "ai_response": ""} for message in messages]
+
+
+def test_search_ranks_and_paginates():
+    index = TurnSearchIndex()
+    index.add_session("a", turns("budget review", "hiring plan budget budget"))
+    index.add_session("b", turns("budget"))
+
+    total, hits = index.search("budget", limit=2)
+    assert total == 3
+    assert [(hit["session_id"], hit["turn_offset"]) for hit in hits] == [("b", 0), ("a", 1)]
+
+    total, hits = index.search("budget", limit=2, offset=2)
+    assert total == 3
+    assert [(hit["session_id"], hit["turn_offset"]) for hit in hits] == [("a", 0)]
+
+
+def test_remove_sessions_drops_every_turn():
+    index = TurnSearchIndex()
+    index.add_session("a", turns("budget review", "hiring plan"))
+    index.add_session("b", turns("budget forecast"))
+    index.add_session("c", turns("hiring"))
+
+    index.remove_sessions(["a", "c", "missing"])
+
+    assert len(index) == 1
+    assert index.search("hiring") == (0, [])
+    total, hits = index.search("budget")
+    assert total == 1
+    assert hits[0]["session_id"] == "b"
+
+
+def test_add_turn_uses_given_offset():
+    index = TurnSearchIndex()
+    index.add_turn("a", 1, "second turn")
+    index.add_turn("a", 0, "first turn")
+
+    _, hits = index.search("second")
+    assert hits[0]["turn_offset"] == 1
+
+
+def test_tokenize_keeps_non_ascii_words():
+    assert tokenize("Réunion über Café, STRASSE 42") == ["réunion", "über", "café", "strasse", "42"]
+    assert tokenize("Straße") == ["strasse"]
+
+    index = TurnSearchIndex()
+    index.add_session("a", turns("Notes de la réunion", "会議 notes"))
+    assert [hit["turn_offset"] for hit in index.search("RÉUNION")[1]] == [0]
+    assert [hit["turn_offset"] for hit in index.search("会議")[1]] == [1]
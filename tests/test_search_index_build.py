@@ -0,0 +1,85 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("emergentintegrations")
+mongomock_motor = pytest.importorskip("mongomock_motor")
+
+from fastapi.testclient import TestClient
+
+import server
+from search_index import TurnSearchIndex
+
+
+@pytest.fixture
+def db(monkeypatch):
+    test_db = mongomock_motor.AsyncMongoMockClient()["search_build_test"]
+    monkeypatch.setattr(server, "db", test_db)
+    monkeypatch.setattr(server, "search_index", TurnSearchIndex())
+    monkeypatch.setattr(server, "search_index_state", "warming")
+    monkeypatch.setattr(server, "pending_index_turns", [])
+    monkeypatch.setattr(server, "pending_index_removals", [])
+    monkeypatch.setattr(server, "SEARCH_INDEX_RETRY_SECONDS", 0.05)
+    return test_db
+
+
+def test_failed_build_is_retried(db, monkeypatch):
+    attempts = []
+    build = server.build_search_index
+
+    async def flaky_build():
+        attempts.append(server.search_index_state)
+        if len(attempts) == 1:
+            raise RuntimeError("connection refused")
+        await build()
+
+    monkeypatch.setattr(server, "build_search_index", flaky_build)
+
+    async def scenario():
+        await db.meeting_sessions.insert_one({
+            "id": "s1",
+            "title": "Budget review",
+            "conversation_history": [{"user_message": "budget freeze", "ai_response": "agreed"}],
+        })
+        task = asyncio.create_task(server.run_search_index_build())
+        await asyncio.sleep(0.01)
+        assert server.search_index_state == "failed"
+        # Nothing is queued while failed; the retry reads the turn from Mongo
+        await server.index_turn("s1", 1, {"user_message": "late", "ai_response": "turn"})
+        await server.unindex_sessions(["s2"])
+        assert server.pending_index_turns == []
+        assert server.pending_index_removals == []
+        await asyncio.wait_for(task, 1)
+
+    asyncio.run(scenario())
+
+    assert attempts == ["warming", "warming"]
+    assert server.search_index_state == "ready"
+    total, hits = server.search_index.search("budget")
+    assert total == 1 and hits[0]["session_id"] == "s1"
+
+
+def test_search_reports_failed_build(db, monkeypatch):
+    client = TestClient(server.app)
+
+    response = client.get("/api/search", params={"q": "budget"})
+    assert response.status_code == 503
+    assert response.json()["detail"] == "Search index is warming up"
+
+    monkeypatch.setattr(server, "search_index_state", "failed")
+    response = client.get("/api/search", params={"q": "budget"})
+    assert response.status_code == 503
+    assert response.json()["detail"] == "Search index build failed, retrying"
+    assert "Retry-After" in response.headers
+
+
+def test_search_rejects_oversized_queries(db, monkeypatch):
+    monkeypatch.setattr(server, "search_index_state", "ready")
+    client = TestClient(server.app)
+
+    words = [f"term{i}" for i in range(server.SEARCH_MAX_TERMS + 1)]
+    assert client.get("/api/search", params={"q": " ".join(words[:-1])}).status_code == 200
+    # Repeated terms count once
+    assert client.get("/api/search", params={"q": " ".join(words[:-1] * 2)}).status_code == 200
+    assert client.get("/api/search", params={"q": " ".join(words)}).status_code == 400
+    assert client.get("/api/search", params={"q": "a" * (server.SEARCH_MAX_QUERY_LENGTH + 1)}).status_code == 422
@@ -0,0 +1,187 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+pytest.importorskip("emergentintegrations")
+mongomock_motor = pytest.importorskip("mongomock_motor")
+
+from fastapi.testclient import TestClient
+
+import server
+from archive_store import ArchiveStore
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    test_db = mongomock_motor.AsyncMongoMockClient()["archive_test"]
+    monkeypatch.setattr(server, "db", test_db)
+    monkeypatch.setattr(server, "archive_store", ArchiveStore(tmp_path))
+    monkeypatch.setattr(server, "ARCHIVE_AFTER_DAYS", 0)
+    return test_db
+
+
+def ended_session(turns: int) -> dict:
+    return server.MeetingSession(
+        title="Quarterly planning, \"Q3\"",
+        profile_id="profile",
+        status="ended",
+        ended_at=datetime.utcnow() - timedelta(minutes=1),
+        conversation_history=[
+            {
+                "user_message": f"Speaker {i}: what about item {i}?",
+                "ai_response": f"Item {i} is on track,\nmostly.",
+                "timestamp": f"2025-01-01T10:00:{i:02d}",
+            }
+            for i in range(turns)
+        ],
+    ).dict()
+
+
+def export_all(client: TestClient, session_id: str) -> dict:
+    exports = {}
+    for fmt in ("ndjson", "csv", "md"):
+        response = client.get(f"/api/sessions/{session_id}/export", params={"format": fmt})
+        assert response.status_code == 200
+        exports[fmt] = response.text
+    return exports
+
+
+def test_archived_export_matches_live_export(db, tmp_path):
+    session = ended_session(3)
+    asyncio.run(db.meeting_sessions.insert_one(dict(session)))
+    client = TestClient(server.app)
+
+    before = export_all(client, session["id"])
+    assert len(before["ndjson"].splitlines()) == 3
+
+    assert asyncio.run(server.archive_ended_sessions()) == 1
+
+    assert export_all(client, session["id"]) == before
+    stored = client.get(f"/api/sessions/{session['id']}").json()
+    assert stored["archived"] is True
+    assert stored["turn_count"] == 3
+    assert stored["conversation_history"] == []
+    stored_file = asyncio.run(db.meeting_sessions.find_one({"id": session["id"]}))["archive_file"]
+    assert [p.name for p in tmp_path.iterdir()] == [stored_file]
+
+    # Already archived sessions are not picked up again
+    assert asyncio.run(server.archive_ended_sessions()) == 0
+
+
+def test_turn_appended_during_archiving_keeps_session_live(db, tmp_path):
+    session = ended_session(3)
+
+    async def archive_with_concurrent_turn():
+        await db.meeting_sessions.insert_one(dict(session))
+        snapshot = await db.meeting_sessions.find_one({"id": session["id"]})
+        # A chat turn lands after the archiver read the session
+        await db.meeting_sessions.update_one(
+            {"id": session["id"]},
+            {"$push": {"conversation_history": {"user_message": "late", "ai_response": "turn"}}}
+        )
+        return await server.archive_session(snapshot)
+
+    assert asyncio.run(archive_with_concurrent_turn()) is False
+
+    stored = asyncio.run(db.meeting_sessions.find_one({"id": session["id"]}))
+    assert stored["archived"] is False
+    assert len(stored["conversation_history"]) == 4
+    assert not any(tmp_path.iterdir())
+
+
+def test_racing_archivers_keep_one_archive(db, tmp_path):
+    session = ended_session(3)
+    asyncio.run(db.meeting_sessions.insert_one(dict(session)))
+    client = TestClient(server.app)
+    before = export_all(client, session["id"])
+
+    async def archive_twice():
+        # Both archivers read the session before either one stores its archive
+        first = await db.meeting_sessions.find_one({"id": session["id"]})
+        second = await db.meeting_sessions.find_one({"id": session["id"]})
+        return await asyncio.gather(server.archive_session(first), server.archive_session(second))
+
+    assert sorted(asyncio.run(archive_twice())) == [False, True]
+
+    stored = asyncio.run(db.meeting_sessions.find_one({"id": session["id"]}))
+    assert stored["archived"] is True
+    assert [p.name for p in tmp_path.iterdir()] == [stored["archive_file"]]
+    assert export_all(client, session["id"]) == before
+
+
+class ArchivingChat:
+    """Chat stub that runs ``during_reply`` while the response is generated"""
+
+    def __init__(self, during_reply):
+        self.during_reply = during_reply
+
+    async def send_message(self, user_message):
+        await self.during_reply()
+        return "Noted."
+
+
+@pytest.mark.parametrize("outcome", ["archived", "deleted"])
+def test_chat_does_not_write_into_archived_or_deleted_session(db, monkeypatch, outcome):
+    profile = server.MeetingProfile(name="Ada", role="PM", personality="calm", response_style="brief").dict()
+    session = ended_session(2)
+    session["profile_id"] = profile["id"]
+
+    async def archive_or_delete():
+        if outcome == "archived":
+            assert await server.archive_session(await db.meeting_sessions.find_one({"id": session["id"]}))
+        else:
+            await db.meeting_sessions.delete_one({"id": session["id"]})
+
+    async def fake_chat(session_id, profile):
+        return ArchivingChat(archive_or_delete)
+
+    async def setup():
+        await db.meeting_profiles.insert_one(dict(profile))
+        await db.meeting_sessions.insert_one(dict(session))
+
+    asyncio.run(setup())
+    monkeypatch.setattr(server, "get_ai_chat", fake_chat)
+    client = TestClient(server.app)
+
+    response = client.post(f"/api/sessions/{session['id']}/chat", params={"message": "one more thing"})
+    assert response.status_code == 409
+
+    stored = asyncio.run(db.meeting_sessions.find_one({"id": session["id"]}))
+    if outcome == "archived":
+        assert stored["conversation_history"] == []
+        assert stored["turn_count"] == 2
+    else:
+        assert stored is None
+
+
+def test_ending_again_keeps_ended_at(db):
+    sessions = [ended_session(1), ended_session(1)]
+    for session in sessions:
+        session.update(status="active", ended_at=None)
+    asyncio.run(db.meeting_sessions.insert_many([dict(session) for session in sessions]))
+    client = TestClient(server.app)
+
+    def ended_at(session):
+        return asyncio.run(db.meeting_sessions.find_one({"id": session["id"]}))["ended_at"]
+
+    assert client.put(f"/api/sessions/{sessions[0]['id']}/status", params={"status": "ended"}).status_code == 200
+    first_end = ended_at(sessions[0])
+    assert first_end is not None
+
+    assert client.put(f"/api/sessions/{sessions[0]['id']}/status", params={"status": "ended"}).status_code == 200
+    response = client.put("/api/sessions/bulk-status", json={
+        "filter": {"ids": [session["id"] for session in sessions]},
+        "status": "ended",
+    })
+    assert response.json() == {"matched": 2, "modified": 1}
+    assert ended_at(sessions[0]) == first_end
+    assert ended_at(sessions[1]) is not None
+
+
+def test_sessions_without_ended_at_age_by_created_at(db):
+    session = ended_session(1)
+    session.update(ended_at=None, created_at=datetime.utcnow() - timedelta(days=1))
+    asyncio.run(db.meeting_sessions.insert_one(dict(session)))
+
+    assert asyncio.run(server.archive_ended_sessions()) == 1